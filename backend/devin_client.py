@@ -2,12 +2,101 @@ import httpx
 import os
 import asyncio
 import json
+import orjson
+import random
+import re
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The plan runs from the line after its header up to the confidence line (or the end of the message)
+_ACTION_PLAN_RE = re.compile(r'ACTION PLAN:[^\n]*\n?(.*?)(?=^[^\n]*CONFIDENCE(?: SCORE)?:|\Z)', re.IGNORECASE | re.DOTALL | re.MULTILINE)
+_CONFIDENCE_RE = re.compile(r'CONFIDENCE(?: SCORE)?:[^\n]*?(\d+)', re.IGNORECASE)
+
+# Extraction results keyed by (session ID, message count), so re-polls with no new messages don't re-parse
+MAX_EXTRACTION_CACHE_ENTRIES = 256
+_extraction_cache: Dict[tuple, tuple] = {}
+
+TERMINAL_STATUSES = frozenset({"finished", "expired"})
+
+# Module-local so tests can replace the polling delay without patching asyncio for everything else
+_sleep = asyncio.sleep
+
+ANALYZE_TEMPLATE = """
+Please analyze this GitHub issue and provide:
+1. A detailed action plan (step-by-step approach)
+2. A confidence score (1-100%) indicating your ability to resolve this issue
+
+Issue Title: {title}
+Issue Description: {body}
+{repo_line}
+
+Please format your response as:
+ACTION PLAN:
+[Your detailed step-by-step plan]
+
+CONFIDENCE SCORE: [Your confidence percentage]%
+"""
+
+RESOLVE_TEMPLATE = """
+Please resolve this GitHub issue by implementing the necessary changes:
+
+Repository: {repo}
+Issue #{number}: {title}
+Description: {body}
+
+Please:
+1. Analyze the issue thoroughly
+2. Implement the necessary code changes
+3. Create a pull request with your solution
+4. Provide regular updates on your progress
+
+Post updates as comments on the GitHub issue as you work.
+"""
+
+def build_analyze_prompt(issue_title: str, issue_body: Optional[str] = None, repo: Optional[str] = None) -> str:
+    """Fill ANALYZE_TEMPLATE for an issue; the repository line is omitted when no repo is given."""
+    return ANALYZE_TEMPLATE.format_map({
+        "title": issue_title,
+        "body": issue_body or "No description provided",
+        "repo_line": f"Repository: {repo}" if repo else ""
+    })
+
+def build_resolve_prompt(issue_number: int, issue_title: str, issue_body: Optional[str] = None, repo: Optional[str] = None) -> str:
+    """Fill RESOLVE_TEMPLATE for an issue."""
+    return RESOLVE_TEMPLATE.format_map({
+        "repo": repo or "Not specified",
+        "number": issue_number,
+        "title": issue_title,
+        "body": issue_body or "No description provided"
+    })
+
+class DevinAPIError(Exception):
+    """Raised when a Devin API request fails. `status_code` is None for timeouts."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+    
+    @property
+    def is_transient(self) -> bool:
+        """Whether the failure is worth retrying (timeouts, rate limiting and 5xx responses)."""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+def _is_transient_error(error: Exception) -> bool:
+    if isinstance(error, DevinAPIError):
+        return error.is_transient
+    return isinstance(error, httpx.TransportError)
+
+def _backoff_ceiling(attempt: int, initial_interval: float, backoff_base: float, max_interval: float) -> float:
+    """Upper bound of the jittered delay for the given attempt, capped at `max_interval`."""
+    try:
+        return min(max_interval, initial_interval * backoff_base ** attempt)
+    except OverflowError:
+        return max_interval
+
 class DevinClient:
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("DEVIN_API_KEY")
@@ -15,123 +104,167 @@ class DevinClient:
         
         if not self.api_key:
             raise ValueError("Devin API key is required")
+        
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=50, keepalive_expiry=60)
+        )
+    
+    async def close(self):
+        """Close the underlying HTTP client and release pooled connections."""
+        await self._client.aclose()
     
-    def _get_auth_headers(self) -> Dict[str, str]:
-        """Get the authentication headers for Devin API requests."""
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+    async def __aenter__(self) -> "DevinClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
     
     async def create_session(self, prompt: str) -> Dict[str, Any]:
         """Create a new Devin session with the initial prompt."""
-        headers = self._get_auth_headers()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/sessions",
-                    headers=headers,
-                    json={"prompt": prompt}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to create Devin session: {response.status_code} - {response.text}")
-                    raise Exception(f"Failed to create Devin session: HTTP {response.status_code}")
-                    
-                return response.json()
-            except httpx.TimeoutException:
-                logger.error("Timeout creating Devin session")
-                raise Exception("Timeout creating Devin session")
-            except Exception as e:
-                logger.error(f"Error creating Devin session: {str(e)}")
-                raise
+        try:
+            response = await self._client.post("/sessions", json={"prompt": prompt})
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except httpx.TimeoutException:
+            logger.error("Timeout creating Devin session")
+            raise DevinAPIError("Timeout creating Devin session")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to create Devin session: {e.response.status_code} - {e.response.text}")
+            raise DevinAPIError(f"Failed to create Devin session: HTTP {e.response.status_code}", e.response.status_code)
+        except Exception as e:
+            logger.error(f"Error creating Devin session: {str(e)}")
+            raise
     
     async def send_message(self, session_id: str, message: str) -> Dict[str, Any]:
         """Send a message to an existing Devin session."""
-        headers = self._get_auth_headers()
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/session/{session_id}/message",
-                    headers=headers,
-                    json={"message": message}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to send message to Devin session: {response.status_code} - {response.text}")
-                    raise Exception(f"Failed to send message to Devin session: HTTP {response.status_code}")
-                    
-                return response.json()
-            except httpx.TimeoutException:
-                logger.error("Timeout sending message to Devin session")
-                raise Exception("Timeout sending message to Devin session")
-            except Exception as e:
-                logger.error(f"Error sending message to Devin session: {str(e)}")
-                raise
+        try:
+            response = await self._client.post(f"/session/{session_id}/message", json={"message": message})
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except httpx.TimeoutException:
+            logger.error("Timeout sending message to Devin session")
+            raise DevinAPIError("Timeout sending message to Devin session")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to send message to Devin session: {e.response.status_code} - {e.response.text}")
+            raise DevinAPIError(f"Failed to send message to Devin session: HTTP {e.response.status_code}", e.response.status_code)
+        except Exception as e:
+            logger.error(f"Error sending message to Devin session: {str(e)}")
+            raise
     
     async def get_session_details(self, session_id: str) -> Dict[str, Any]:
         """Get the current status and details of a Devin session."""
-        headers = self._get_auth_headers()
+        try:
+            response = await self._client.get(f"/session/{session_id}")
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except httpx.TimeoutException:
+            logger.error("Timeout getting Devin session details")
+            raise DevinAPIError("Timeout getting Devin session details")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to get Devin session details: {e.response.status_code} - {e.response.text}")
+            raise DevinAPIError(f"Failed to get Devin session details: HTTP {e.response.status_code}", e.response.status_code)
+        except Exception as e:
+            logger.error(f"Error getting Devin session details: {str(e)}")
+            raise
+    
+    async def get_sessions_details(self, session_ids: List[str], max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Get the details of several sessions concurrently over the shared connection pool.
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/session/{session_id}",
-                    headers=headers
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Failed to get Devin session details: {response.status_code} - {response.text}")
-                    raise Exception(f"Failed to get Devin session details: HTTP {response.status_code}")
-                    
-                return response.json()
-            except httpx.TimeoutException:
-                logger.error("Timeout getting Devin session details")
-                raise Exception("Timeout getting Devin session details")
-            except Exception as e:
-                logger.error(f"Error getting Devin session details: {str(e)}")
-                raise
+        Args:
+            session_ids: The session IDs to fetch
+            max_concurrency: Maximum number of requests in flight at once
+        
+        Returns:
+            Mapping of session ID to its details, or to the exception raised while fetching it
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(session_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_session_details(session_id)
+        
+        results = await asyncio.gather(*(fetch(session_id) for session_id in session_ids), return_exceptions=True)
+        return dict(zip(session_ids, results))
     
-    async def wait_for_completion(self, session_id: str, max_wait_time: int = 1800, poll_interval: int = 30) -> Dict[str, Any]:
+    async def wait_for_completion(
+        self,
+        session_id: str,
+        max_wait_time: int = 1800,
+        poll_interval: int = 30,
+        initial_poll_interval: float = 0.5,
+        poll_backoff_base: float = 1.3
+    ) -> Dict[str, Any]:
         """
         Wait for a Devin session to complete and return the final results.
         
+        Polling starts at `initial_poll_interval` and grows by `poll_backoff_base` per
+        poll (with full jitter) up to `poll_interval`. The delay resets whenever the
+        session status changes. Transient API errors are retried on their own backoff.
+        
         Args:
             session_id: The session ID to monitor
             max_wait_time: Maximum time to wait in seconds (default 30 minutes)
-            poll_interval: How often to check status in seconds (default 30 seconds)
+            poll_interval: Maximum delay between status checks in seconds (default 30 seconds)
+            initial_poll_interval: Delay ceiling for the first status check in seconds
+            poll_backoff_base: Multiplier applied to the delay ceiling after each unchanged poll
         
         Returns:
             Final session details when completed
         """
         start_time = datetime.now()
+        attempt = 0
+        error_attempt = 0
+        last_status = None
         
         while True:
+            elapsed = (datetime.now() - start_time).total_seconds()
+            
             try:
                 session_details = await self.get_session_details(session_id)
-                status_enum = session_details.get("status_enum")
-                status = status_enum.lower() if status_enum else "unknown"
-                
-                if status in ["finished", "expired"]:
-                    logger.info(f"Devin session {session_id} completed with status: {status}")
-                    return session_details
-                elif status == "blocked":
-                    logger.warning(f"Devin session {session_id} is blocked - may need user input")
-                    return session_details
-                
-                elapsed = (datetime.now() - start_time).total_seconds()
-                if elapsed > max_wait_time:
-                    logger.warning(f"Devin session {session_id} timed out after {max_wait_time} seconds")
-                    return session_details
-                
-                logger.info(f"Devin session {session_id} status: {status}, waiting {poll_interval}s...")
-                await asyncio.sleep(poll_interval)
-                
             except Exception as e:
-                logger.error(f"Error monitoring Devin session {session_id}: {str(e)}")
-                raise
+                if not _is_transient_error(e) or elapsed > max_wait_time:
+                    logger.error(f"Error monitoring Devin session {session_id}: {str(e)}")
+                    raise
+                
+                delay = random.uniform(0, _backoff_ceiling(error_attempt, initial_poll_interval, poll_backoff_base, poll_interval))
+                error_attempt += 1
+                logger.warning(f"Transient error polling Devin session {session_id}: {str(e)}, retrying in {delay:.1f}s")
+                await _sleep(delay)
+                continue
+            
+            error_attempt = 0
+            status_enum = session_details.get("status_enum")
+            status = status_enum.lower() if status_enum else "unknown"
+            
+            if status in TERMINAL_STATUSES:
+                logger.info(f"Devin session {session_id} completed with status: {status}")
+                return session_details
+            elif status == "blocked":
+                logger.warning(f"Devin session {session_id} is blocked - may need user input")
+                return session_details
+            
+            if elapsed > max_wait_time:
+                logger.warning(f"Devin session {session_id} timed out after {max_wait_time} seconds")
+                return session_details
+            
+            if status != last_status:
+                logger.info(f"Devin session {session_id} status: {status}")
+                attempt = 0
+                last_status = status
+            
+            delay = random.uniform(0, _backoff_ceiling(attempt, initial_poll_interval, poll_backoff_base, poll_interval))
+            attempt += 1
+            
+            logger.debug(f"Devin session {session_id} status: {status}, waiting {delay:.1f}s...")
+            await _sleep(delay)
     
     def extract_action_plan_and_confidence(self, session_details: Dict[str, Any]) -> tuple[Optional[str], Optional[int]]:
         """
@@ -144,38 +277,43 @@ class DevinClient:
             Tuple of (action_plan, confidence_score)
         """
         messages = session_details.get("messages", [])
+        session_id = session_details.get("session_id")
+        cache_key = (session_id, len(messages))
+        if session_id and cache_key in _extraction_cache:
+            return _extraction_cache[cache_key]
+        
         action_plan = None
         confidence_score = None
         
-        for message in messages:
-            if message.get("type") == "devin_message":
-                content = message.get("message", "")
-                
-                if "ACTION PLAN:" in content.upper():
-                    lines = content.split('\n')
-                    plan_started = False
-                    plan_lines = []
-                    
-                    for line in lines:
-                        if "ACTION PLAN:" in line.upper():
-                            plan_started = True
-                            continue
-                        elif "CONFIDENCE SCORE:" in line.upper() or "CONFIDENCE:" in line.upper():
-                            plan_started = False
-                            confidence_text = line.split(":")[-1].strip()
-                            try:
-                                import re
-                                match = re.search(r'(\d+)', confidence_text)
-                                if match:
-                                    confidence_score = int(match.group(1))
-                                    logger.info(f"Successfully extracted confidence score: {confidence_score}")
-                            except (ValueError, AttributeError):
-                                logger.warning(f"Could not parse confidence score from: {confidence_text}")
-                        elif plan_started and line.strip():
-                            plan_lines.append(line.strip())
-                    
-                    if plan_lines:
-                        action_plan = '\n'.join(plan_lines)
+        devin_messages = (message for message in reversed(messages) if message.get("type") == "devin_message")
+        
+        for message in devin_messages:
+            content = message.get("message", "")
+            plan_match = _ACTION_PLAN_RE.search(content)
+            if not plan_match:
+                continue
+            
+            plan_lines = [line.strip() for line in plan_match.group(1).splitlines() if line.strip()]
+            
+            message_confidence = None
+            confidence_match = _CONFIDENCE_RE.search(content, plan_match.start())
+            if confidence_match:
+                message_confidence = int(confidence_match.group(1))
+                logger.info(f"Successfully extracted confidence score: {message_confidence}")
+            
+            # Scanning newest first, so the first plan and score found are the latest ones
+            if action_plan is None and plan_lines:
+                action_plan = '\n'.join(plan_lines)
+            if confidence_score is None and message_confidence is not None:
+                confidence_score = message_confidence
+            
+            if action_plan is not None and confidence_score is not None:
+                break
+        
+        if session_id:
+            if len(_extraction_cache) >= MAX_EXTRACTION_CACHE_ENTRIES:
+                _extraction_cache.pop(next(iter(_extraction_cache)))
+            _extraction_cache[cache_key] = (action_plan, confidence_score)
         
         return action_plan, confidence_score
     
@@ -191,21 +329,7 @@ class DevinClient:
         Returns:
             Dictionary containing session_id, action_plan, confidence_score, and status
         """
-        prompt = f"""
-Please analyze this GitHub issue and provide:
-1. A detailed action plan (step-by-step approach)
-2. A confidence score (1-100%) indicating your ability to resolve this issue
-
-Issue Title: {issue_title}
-Issue Description: {issue_body or "No description provided"}
-{f"Repository: {repo}" if repo else ""}
-
-Please format your response as:
-ACTION PLAN:
-[Your detailed step-by-step plan]
-
-CONFIDENCE SCORE: [Your confidence percentage]%
-"""
+        prompt = build_analyze_prompt(issue_title, issue_body, repo)
         
         try:
             session_response = await self.create_session(prompt)
@@ -229,6 +353,24 @@ CONFIDENCE SCORE: [Your confidence percentage]%
             logger.error(f"Error analyzing GitHub issue: {str(e)}")
             raise
     
+    async def analyze_github_issues(self, issues: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Analyze several GitHub issues concurrently.
+        
+        Args:
+            issues: Dictionaries with an `issue_title` key and optional `issue_body` and `repo` keys
+            
+        Returns:
+            One entry per issue, in order: the analyze_github_issue() result, or the exception it raised
+        """
+        return await asyncio.gather(
+            *(
+                self.analyze_github_issue(issue["issue_title"], issue.get("issue_body"), issue.get("repo"))
+                for issue in issues
+            ),
+            return_exceptions=True
+        )
+    
     async def resolve_github_issue(self, issue_number: int, issue_title: str, issue_body: str = None, repo: str = None) -> Dict[str, Any]:
         """
         Have Devin attempt to resolve a GitHub issue.
@@ -242,21 +384,7 @@ CONFIDENCE SCORE: [Your confidence percentage]%
         Returns:
             Dictionary containing session_id and initial status
         """
-        prompt = f"""
-Please resolve this GitHub issue by implementing the necessary changes:
-
-Repository: {repo or "Not specified"}
-Issue #{issue_number}: {issue_title}
-Description: {issue_body or "No description provided"}
-
-Please:
-1. Analyze the issue thoroughly
-2. Implement the necessary code changes
-3. Create a pull request with your solution
-4. Provide regular updates on your progress
-
-Post updates as comments on the GitHub issue as you work.
-"""
+        prompt = build_resolve_prompt(issue_number, issue_title, issue_body, repo)
         
         try:
             session_response = await self.create_session(prompt)
@@ -274,3 +402,86 @@ Post updates as comments on the GitHub issue as you work.
         except Exception as e:
             logger.error(f"Error starting GitHub issue resolution: {str(e)}")
             raise
+
+
+class DevinSessionPoller:
+    """
+    Polls any number of Devin sessions from a single task.
+    
+    Callers ask for a session's details at least `delay` seconds from now with `request()`. The
+    poller sleeps until the earliest request is due and then fetches every session due within
+    `coalesce_window` seconds of it in one concurrent batch, so many monitors share one timer and
+    one burst of requests over the client's keepalive connections instead of each polling alone.
+    """
+    
+    def __init__(self, client: DevinClient, coalesce_window: float = 1.0, max_concurrency: int = 8):
+        self.client = client
+        self.coalesce_window = coalesce_window
+        self.max_concurrency = max_concurrency
+        self._pending: Dict[str, tuple[float, asyncio.Future]] = {}
+        self._wakeup = asyncio.Event()
+    
+    async def request(self, session_id: str, delay: float = 0) -> Dict[str, Any]:
+        """
+        Wait for the session's details from the first batch polled after `delay` seconds.
+        
+        Concurrent requests for the same session share a single fetch.
+        
+        Raises:
+            The exception raised while fetching the session, if any
+        """
+        loop = asyncio.get_running_loop()
+        due = loop.time() + delay
+        
+        if session_id in self._pending:
+            pending_due, future = self._pending[session_id]
+            self._pending[session_id] = (min(due, pending_due), future)
+        else:
+            future = loop.create_future()
+            self._pending[session_id] = (due, future)
+        
+        self._wakeup.set()
+        # Shielded so one caller giving up doesn't cancel the fetch for others sharing it
+        return await asyncio.shield(future)
+    
+    async def run(self):
+        """Serve requests until cancelled."""
+        loop = asyncio.get_running_loop()
+        batch = {}
+        
+        try:
+            while True:
+                self._wakeup.clear()
+                if not self._pending:
+                    await self._wakeup.wait()
+                    continue
+                
+                wait_time = min(due for due, _ in self._pending.values()) - loop.time()
+                if wait_time > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), wait_time)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                cutoff = loop.time() + self.coalesce_window
+                batch = {session_id: future for session_id, (due, future) in self._pending.items() if due <= cutoff}
+                for session_id in batch:
+                    del self._pending[session_id]
+                
+                logger.debug(f"Polling {len(batch)} Devin sessions")
+                results = await self.client.get_sessions_details(list(batch), self.max_concurrency)
+                
+                for session_id, future in batch.items():
+                    if future.done():
+                        continue
+                    result = results[session_id]
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            # Includes the batch in flight if cancelled mid-fetch, so no caller is left waiting
+            for future in [*batch.values(), *(future for _, future in self._pending.values())]:
+                future.cancel()
+            self._pending.clear()
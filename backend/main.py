@@ -1,17 +1,24 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager, suppress
 from pydantic import BaseModel
 from typing import List, Optional
 import httpx
+import orjson
 import os
 from dotenv import load_dotenv
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import logging
-from devin_client import DevinClient
+import random
+import re
+import threading
+import time
+from devin_client import DevinClient, DevinSessionPoller, TERMINAL_STATUSES, build_analyze_prompt, build_resolve_prompt
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,68 +27,243 @@ load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Starting up - checking for existing incomplete sessions to monitor")
+    # Schema and index creation can take a while on a large database, so keep it off the event loop too
+    app.state.db = await asyncio.to_thread(init_db)
     
-    conn = sqlite3.connect("issues.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT devin_session_id, issue_number, issue_title, status 
-        FROM issue_sessions 
-        WHERE status IN ('scoping', 'resolving', 'blocked')
-    """)
-    incomplete_sessions = cursor.fetchall()
-    conn.close()
-    
-    for session_id, issue_number, issue_title, status in incomplete_sessions:
-        logger.info(f"Starting monitoring for existing session {session_id} (status: {status})")
-        repo = "GoogleCloudPlatform/marketing-analytics-jumpstart"
-        session_type = "scoping" if status in ['scoping', 'blocked'] else "resolving"
-        
-        asyncio.create_task(monitor_devin_session(session_id, issue_number, repo, session_type))
+    github_headers = {
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "GitHub-Issues-Devin-Integration"
+    }
+    if GITHUB_TOKEN:
+        github_headers["Authorization"] = f"token {GITHUB_TOKEN}"
+    
+    app.state.gh_client = httpx.AsyncClient(
+        base_url="https://api.github.com",
+        headers=github_headers,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=50, keepalive_expiry=60),
+        timeout=15.0
+    )
+    
+    app.state.devin_client = None
+    app.state.session_poller = None
+    poller_task = None
+    if DEVIN_API_KEY:
+        app.state.devin_client = DevinClient(DEVIN_API_KEY)
+        # One task polls every monitored session, batching requests that fall due together
+        app.state.session_poller = DevinSessionPoller(app.state.devin_client, max_concurrency=MAX_CONCURRENT_MONITOR_POLLS)
+        poller_task = asyncio.create_task(app.state.session_poller.run())
+    else:
+        logging.warning("DEVIN_API_KEY not provided - Devin integration features will be disabled")
     
-    yield
-    logger.info("Shutting down")
+    # Close the shared clients and connection even if startup or serving fails
+    try:
+        logger.info("Starting up - checking for existing incomplete sessions to monitor")
+        
+        incomplete_sessions = await db_execute(SELECT_INCOMPLETE_SESSIONS_SQL)
+        
+        if incomplete_sessions and not app.state.session_poller:
+            logger.warning("DEVIN_API_KEY not provided - not monitoring existing incomplete sessions")
+            incomplete_sessions = []
+        
+        for session_id, issue_number, issue_title, status in incomplete_sessions:
+            logger.info(f"Starting monitoring for existing session {session_id} (status: {status})")
+            repo = "GoogleCloudPlatform/marketing-analytics-jumpstart"
+            session_type = "scoping" if status in ['scoping', 'blocked'] else "resolving"
+            
+            # Spread the first polls out so a restart with many open sessions doesn't hit Devin all at once
+            initial_delay = random.uniform(0, STARTUP_POLL_SPREAD_SECONDS)
+            asyncio.create_task(monitor_devin_session(session_id, issue_number, repo, session_type, initial_delay))
+        
+        yield
+    finally:
+        logger.info("Shutting down")
+        if poller_task:
+            poller_task.cancel()
+            # Let an in-flight batch finish unwinding before its client is closed
+            with suppress(asyncio.CancelledError):
+                await poller_task
+        await app.state.gh_client.aclose()
+        if app.state.devin_client:
+            await app.state.devin_client.close()
+        await asyncio.to_thread(app.state.db.close)
+
+app = FastAPI(
+    title="GitHub Issues Devin Integration",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
-app = FastAPI(title="GitHub Issues Devin Integration", version="1.0.0", lifespan=lifespan)
+# The frontend sends its Authorization header explicitly and never relies on cookies, so credentials
+# stay disabled and the middleware can answer with a static "*" instead of mirroring each Origin.
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 DEVIN_API_KEY = os.getenv("DEVIN_API_KEY")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "google/meridian")
 
-devin_client = None
-if DEVIN_API_KEY:
-    devin_client = DevinClient(DEVIN_API_KEY)
-else:
-    logging.warning("DEVIN_API_KEY not provided - Devin integration features will be disabled")
+db_lock = threading.Lock()
+
+# Session IDs with a running monitor_devin_session, so each session is only monitored once
+active_monitors = set()
+
+# Caps how many session polls can be in flight to the Devin API at once, however many sessions are active
+MAX_CONCURRENT_MONITOR_POLLS = 8
+# Window over which the first polls of sessions resumed at startup are spread
+STARTUP_POLL_SPREAD_SECONDS = 5.0
 
 def init_db():
-    conn = sqlite3.connect("issues.db")
+    """Open the shared SQLite connection used by the app and make sure the schema exists."""
+    conn = sqlite3.connect("issues.db", check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS issue_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    # Every hot lookup is by Devin session ID, so the table is clustered on it. `id` is kept
+    # (unique, assigned on insert) because /sessions and the dashboard still surface it.
+    schema = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            devin_session_id TEXT PRIMARY KEY,
+            id INTEGER NOT NULL UNIQUE,
             issue_number INTEGER,
             issue_title TEXT,
-            devin_session_id TEXT,
             action_plan TEXT,
             confidence_score INTEGER,
             status TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            blocked_notified INTEGER DEFAULT 0
+        ) WITHOUT ROWID
+    """
+    cursor.execute(schema.format(table="issue_sessions"))
+    
+    columns = {row["name"]: row for row in cursor.execute("PRAGMA table_info(issue_sessions)")}
+    if "blocked_notified" not in columns:
+        cursor.execute("ALTER TABLE issue_sessions ADD COLUMN blocked_notified INTEGER DEFAULT 0")
+    
+    if not columns["devin_session_id"]["pk"]:
+        logger.info("Migrating issue_sessions to a WITHOUT ROWID table keyed by devin_session_id")
+        column_list = ("devin_session_id, id, issue_number, issue_title, action_plan, confidence_score, "
+                       "status, created_at, updated_at, blocked_notified")
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(schema.format(table="issue_sessions_new"))
+            
+            # The new key can't hold rows without a session ID, or more than one row per session ID
+            # (only the latest is kept), so record what is dropped before copying
+            dropped_rows = cursor.execute("""
+                SELECT id, issue_number, devin_session_id FROM issue_sessions
+                WHERE devin_session_id IS NULL
+                   OR id < (SELECT MAX(newer.id) FROM issue_sessions AS newer
+                            WHERE newer.devin_session_id = issue_sessions.devin_session_id)
+            """).fetchall()
+            for row in dropped_rows:
+                logger.warning(
+                    f"Dropping issue_sessions row {row['id']} (issue #{row['issue_number']}, "
+                    f"session {row['devin_session_id']}): missing or superseded session ID"
+                )
+            
+            # Rows are copied oldest first so a duplicated session ID keeps its latest row
+            cursor.execute(f"""
+                INSERT OR REPLACE INTO issue_sessions_new ({column_list})
+                SELECT {column_list} FROM issue_sessions
+                WHERE devin_session_id IS NOT NULL
+                ORDER BY id
+            """)
+            cursor.execute("DROP TABLE issue_sessions")
+            cursor.execute("ALTER TABLE issue_sessions_new RENAME TO issue_sessions")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status ON issue_sessions(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON issue_sessions(created_at DESC)")
+    return conn
+
+def run_db_query(sql: str, params: tuple = ()) -> list:
+    """Run a statement on the shared connection and return any rows. Blocks - use db_execute from async code."""
+    with db_lock:
+        return app.state.db.execute(sql, params).fetchall()
+
+async def db_execute(sql: str, params: tuple = ()) -> list:
+    """Run a statement on the shared connection in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(run_db_query, sql, params)
+
+# Statements run on the shared connection. sqlite3's per-connection statement cache is keyed by
+# SQL text, so keeping each one here as a single string lets every call after the first reuse
+# the compiled statement.
+SELECT_INCOMPLETE_SESSIONS_SQL = """
+    SELECT devin_session_id, issue_number, issue_title, status
+    FROM issue_sessions
+    WHERE status IN ('scoping', 'resolving', 'blocked')
+"""
+
+INSERT_SESSION_SQL = """
+    INSERT INTO issue_sessions (id, issue_number, issue_title, devin_session_id, status)
+    VALUES ((SELECT COALESCE(MAX(id), 0) + 1 FROM issue_sessions), ?, ?, ?, ?)
+"""
+
+UPSERT_SESSION_SQL = """
+    INSERT OR REPLACE INTO issue_sessions (id, issue_number, issue_title, devin_session_id, status)
+    VALUES ((SELECT COALESCE(MAX(id), 0) + 1 FROM issue_sessions), ?, ?, ?, ?)
+"""
+
+MARK_SESSION_TIMEOUT_SQL = """
+    UPDATE issue_sessions
+    SET status = 'timeout', updated_at = CURRENT_TIMESTAMP
+    WHERE devin_session_id = ?
+"""
+
+COMPLETE_SESSION_SQL = """
+    UPDATE issue_sessions
+    SET status = 'completed', updated_at = CURRENT_TIMESTAMP
+    WHERE devin_session_id = ?
+"""
+
+COMPLETE_SCOPING_SESSION_SQL = """
+    UPDATE issue_sessions
+    SET action_plan = ?, confidence_score = ?, status = 'completed', updated_at = CURRENT_TIMESTAMP
+    WHERE devin_session_id = ?
+"""
 
-init_db()
+# Only returns a row the first time the session is seen blocked, so the comment is posted once
+MARK_SESSION_BLOCKED_SQL = """
+    UPDATE issue_sessions
+    SET status = 'blocked', blocked_notified = 1, updated_at = CURRENT_TIMESTAMP
+    WHERE devin_session_id = ? AND blocked_notified = 0
+    RETURNING id
+"""
+
+LIST_SESSIONS_SQL = """
+    SELECT id, issue_number, issue_title, devin_session_id, action_plan,
+           confidence_score, status, created_at, updated_at
+    FROM issue_sessions
+    ORDER BY created_at DESC
+    LIMIT ? OFFSET ?
+"""
+
+LIST_SESSIONS_TRUNCATED_PLAN_SQL = """
+    SELECT id, issue_number, issue_title, devin_session_id, substr(action_plan, 1, ?) AS action_plan,
+           confidence_score, status, created_at, updated_at
+    FROM issue_sessions
+    ORDER BY created_at DESC
+    LIMIT ? OFFSET ?
+"""
 
 
 class GitHubIssue(BaseModel):
@@ -103,33 +285,72 @@ class DevinResolveRequest(BaseModel):
     issue_number: int
     repo: Optional[str] = "google/meridian"
 
+# "owner/repo" with non-empty parts and no whitespace
+REPO_NAME_RE = re.compile(r'[^/\s]+/[^/\s]+')
+
+# Issues are trimmed to what the /issues response model exposes, so cached lists don't hold the rest of GitHub's payload
+GITHUB_ISSUE_FIELDS = tuple(GitHubIssue.model_fields)
+
+MAX_ISSUES_CACHE_ENTRIES = 128
+# Cached issues younger than this are served without asking GitHub at all, so bursts of refreshes cost one request
+ISSUES_CACHE_FRESH_SECONDS = float(os.getenv("ISSUES_CACHE_FRESH_SECONDS", "10"))
+issues_cache = {}
+
+async def fetch_github_issues(repo: str, state: str, labels: Optional[str]):
+    """
+    Fetch a repository's issues (excluding pull requests and trimmed to GITHUB_ISSUE_FIELDS),
+    revalidating the last response by ETag.
+    
+    Responses younger than ISSUES_CACHE_FRESH_SECONDS are returned straight from the cache. Older
+    ones are revalidated, letting GitHub answer 304 Not Modified instead of resending the list.
+    
+    Returns:
+        Tuple of (status_code, issues) where issues is None if the request failed
+    """
+    cache_key = (repo, state, labels)
+    cached = issues_cache.get(cache_key)
+    if cached and time.monotonic() - cached[2] < ISSUES_CACHE_FRESH_SECONDS:
+        return 200, cached[1]
+    
+    params = {"state": state}
+    if labels:
+        params["labels"] = labels
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    
+    response = await app.state.gh_client.get(f"/repos/{repo}/issues", params=params, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        issues_cache[cache_key] = (cached[0], cached[1], time.monotonic())
+        return 200, cached[1]
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    issues_data = orjson.loads(response.content)
+    filtered_issues = [
+        {field: issue.get(field) for field in GITHUB_ISSUE_FIELDS}
+        for issue in issues_data if 'pull_request' not in issue
+    ]
+    
+    etag = response.headers.get("ETag")
+    if etag:
+        issues_cache.pop(cache_key, None)
+        if len(issues_cache) >= MAX_ISSUES_CACHE_ENTRIES:
+            issues_cache.pop(next(iter(issues_cache)))
+        issues_cache[cache_key] = (etag, filtered_issues, time.monotonic())
+    
+    return 200, filtered_issues
+
 async def get_github_issues(repo: str, state: str = "open", labels: Optional[str] = None):
     if not GITHUB_TOKEN:
         logging.warning("GITHUB_TOKEN not provided - attempting to fetch public issues without authentication (rate limited)")
         try:
-            headers = {
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "GitHub-Issues-Devin-Integration"
-            }
-            
-            params = {"state": state}
-            if labels:
-                params["labels"] = labels
+            status_code, filtered_issues = await fetch_github_issues(repo, state, labels)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.github.com/repos/{repo}/issues",
-                    headers=headers,
-                    params=params
-                )
-                
-                if response.status_code == 200:
-                    issues_data = response.json()
-                    filtered_issues = [issue for issue in issues_data if 'pull_request' not in issue]
-                    logging.info(f"Successfully fetched {len(filtered_issues)} public issues from {repo}")
-                    return filtered_issues
-                else:
-                    logging.warning(f"Failed to fetch public issues (status {response.status_code}), falling back to mock data")
+            if filtered_issues is not None:
+                logging.info(f"Successfully fetched {len(filtered_issues)} public issues from {repo}")
+                return filtered_issues
+            else:
+                logging.warning(f"Failed to fetch public issues (status {status_code}), falling back to mock data")
         except Exception as e:
             logging.warning(f"Error fetching public issues: {e}, falling back to mock data")
         
@@ -158,58 +379,48 @@ async def get_github_issues(repo: str, state: str = "open", labels: Optional[str
             }
         ]
     
-    if "/" not in repo or len(repo.split("/")) != 2:
+    if not REPO_NAME_RE.fullmatch(repo):
         raise HTTPException(
             status_code=400,
             detail="Repository must be in format 'owner/repo'"
         )
     
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    status_code, filtered_issues = await fetch_github_issues(repo, state, labels)
     
-    params = {"state": state}
-    if labels:
-        params["labels"] = labels
+    if filtered_issues is None:
+        raise HTTPException(status_code=status_code, detail="Failed to fetch GitHub issues")
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"https://api.github.com/repos/{repo}/issues",
-            headers=headers,
-            params=params
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail="Failed to fetch GitHub issues")
-        
-        issues_data = response.json()
-        filtered_issues = [issue for issue in issues_data if 'pull_request' not in issue]
-        
-        return filtered_issues
+    return filtered_issues
 
 async def post_github_comment(issue_number: int, comment: str, repo: str = "google/meridian"):
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    response = await app.state.gh_client.post(
+        f"/repos/{repo}/issues/{issue_number}/comments",
+        json={"body": comment}
+    )
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"https://api.github.com/repos/{repo}/issues/{issue_number}/comments",
-            headers=headers,
-            json={"body": comment}
-        )
-        
-        if response.status_code != 201:
-            raise HTTPException(status_code=response.status_code, detail="Failed to post comment")
-        
-        return response.json()
+    if response.status_code != 201:
+        raise HTTPException(status_code=response.status_code, detail="Failed to post comment")
+    
+    return orjson.loads(response.content)
+
+async def record_session(insert_sql: str, insert_params: tuple, issue_number: int):
+    """Insert a new session row. A failure is logged rather than raised, since the caller still gets the session ID back."""
+    try:
+        await db_execute(insert_sql, insert_params)
+    except Exception as e:
+        logger.error(f"Failed to record Devin session for issue #{issue_number}: {str(e)}")
+
+async def post_started_comment(issue_number: int, comment: str, repo: str):
+    """Post the "started" comment on an issue. Runs as a background task, so failures are only logged."""
+    try:
+        await post_github_comment(issue_number, comment, repo)
+    except Exception as e:
+        logger.error(f"Failed to post started comment on issue #{issue_number}: {str(e)}")
 
 async def create_devin_session(prompt: str):
     """Create a new Devin session with the given prompt."""
     try:
-        response = await devin_client.create_session(prompt)
+        response = await app.state.devin_client.create_session(prompt)
         return {
             "session_id": response.get("session_id"),
             "status": "created",
@@ -222,7 +433,7 @@ async def create_devin_session(prompt: str):
 async def send_devin_message(session_id: str, message: str):
     """Send a message to an existing Devin session."""
     try:
-        response = await devin_client.send_message(session_id, message)
+        response = await app.state.devin_client.send_message(session_id, message)
         return {
             "session_id": session_id,
             "status": "message_sent",
@@ -234,11 +445,11 @@ async def send_devin_message(session_id: str, message: str):
 async def get_devin_session_status(session_id: str):
     """Get the current status and details of a Devin session."""
     try:
-        return await devin_client.get_session_details(session_id)
+        return await app.state.devin_client.get_session_details(session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get Devin session status: {str(e)}")
 
-async def monitor_devin_session(session_id: str, issue_number: int, repo: str, session_type: str = "scoping"):
+async def monitor_devin_session(session_id: str, issue_number: int, repo: str, session_type: str = "scoping", initial_delay: float = 0):
     """
     Background task to monitor a Devin session and post results when complete.
     
@@ -247,56 +458,53 @@ async def monitor_devin_session(session_id: str, issue_number: int, repo: str, s
         issue_number: The GitHub issue number
         repo: The repository name
         session_type: Either "scoping" or "resolving"
+        initial_delay: Seconds to wait before the first poll
     """
     logger = logging.getLogger(__name__)
+    devin_client = app.state.devin_client
+    session_poller = app.state.session_poller
+    
+    # A session can be picked up both by its endpoint and by the startup scan after a restart
+    if session_id in active_monitors:
+        logger.info(f"Devin session {session_id} is already being monitored")
+        return
+    active_monitors.add(session_id)
     logger.info(f"Starting to monitor Devin session {session_id} for issue #{issue_number}")
     
-    max_wait_time = 1800  # 30 minutes
-    poll_interval = 30    # 30 seconds
-    start_time = datetime.now()
+    max_wait_time = 1800     # 30 minutes
+    poll_interval = 2.0      # grows 1.5x per poll (2x after errors) up to max_poll_interval
+    max_poll_interval = 60   # 1 minute
+    next_poll_delay = initial_delay
+    # The loop clock is monotonic, so wall-clock adjustments can't end monitoring early or late
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_time
     
     try:
         while True:
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if elapsed > max_wait_time:
+            if loop.time() > deadline:
                 logger.warning(f"Session {session_id} monitoring timed out after {max_wait_time} seconds")
                 
-                conn = sqlite3.connect("issues.db")
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE issue_sessions 
-                    SET status = 'timeout', updated_at = CURRENT_TIMESTAMP
-                    WHERE devin_session_id = ?
-                """, (session_id,))
-                conn.commit()
-                conn.close()
+                await db_execute(MARK_SESSION_TIMEOUT_SQL, (session_id,))
                 
                 timeout_comment = f"⏰ **Devin Session Timeout**\n\nThe Devin analysis session `{session_id}` has timed out after 30 minutes. Please try again or contact support if this issue persists."
                 await post_github_comment(issue_number, timeout_comment, repo)
                 break
             
             try:
-                session_details = await devin_client.get_session_details(session_id)
+                session_details = await session_poller.request(session_id, next_poll_delay)
                 status_enum = session_details.get("status_enum")
                 status = status_enum.lower() if status_enum else "unknown"
                 
                 logger.info(f"Session {session_id} status: {status}")
                 
-                if status in ["finished", "expired"]:
+                if status in TERMINAL_STATUSES:
                     logger.info(f"Session {session_id} completed with status: {status}")
+                    completed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
                     
                     if session_type == "scoping":
                         action_plan, confidence_score = devin_client.extract_action_plan_and_confidence(session_details)
                         
-                        conn = sqlite3.connect("issues.db")
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE issue_sessions 
-                            SET action_plan = ?, confidence_score = ?, status = 'completed', updated_at = CURRENT_TIMESTAMP
-                            WHERE devin_session_id = ?
-                        """, (action_plan, confidence_score, session_id))
-                        conn.commit()
-                        conn.close()
+                        await db_execute(COMPLETE_SCOPING_SESSION_SQL, (action_plan, confidence_score, session_id))
                         
                         if action_plan and confidence_score:
                             results_comment = f"""## 🤖 Devin Analysis Results
@@ -306,7 +514,7 @@ async def monitor_devin_session(session_id: str, issue_number: int, repo: str, s
 
 ---
 *Session ID: `{session_id}`*
-*Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}*"""
+*Analysis completed at: {completed_at}*"""
                         else:
                             results_comment = f"""## 🤖 Devin Analysis Complete
 
@@ -315,7 +523,7 @@ The analysis session has completed, but I was unable to extract a structured act
 **Session Details:**
 - Session ID: `{session_id}`
 - Status: {status}
-- Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+- Completed at: {completed_at}
 
 Please check the [Devin session]({session_details.get('url', '#')}) for detailed results."""
                         
@@ -323,15 +531,7 @@ Please check the [Devin session]({session_details.get('url', '#')}) for detailed
                         
                     else:  # resolving session
                         # Update database status for resolution sessions
-                        conn = sqlite3.connect("issues.db")
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE issue_sessions 
-                            SET status = 'completed', updated_at = CURRENT_TIMESTAMP
-                            WHERE devin_session_id = ?
-                        """, (session_id,))
-                        conn.commit()
-                        conn.close()
+                        await db_execute(COMPLETE_SESSION_SQL, (session_id,))
                         
                         completion_comment = f"""## 🚀 Devin Resolution Complete
 
@@ -340,7 +540,7 @@ The issue resolution session has completed successfully!
 **Session Details:**
 - Session ID: `{session_id}`
 - Status: {status}
-- Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+- Completed at: {completed_at}
 
 Please check the [Devin session]({session_details.get('url', '#')}) for detailed results and any pull requests that may have been created."""
                         
@@ -358,16 +558,9 @@ Please check the [Devin session]({session_details.get('url', '#')}) for detailed
                         
                         if action_plan and confidence_score:
                             logger.info(f"Session {session_id} completed analysis while blocked - processing results")
+                            completed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
                             
-                            conn = sqlite3.connect("issues.db")
-                            cursor = conn.cursor()
-                            cursor.execute("""
-                                UPDATE issue_sessions 
-                                SET action_plan = ?, confidence_score = ?, status = 'completed', updated_at = CURRENT_TIMESTAMP
-                                WHERE devin_session_id = ?
-                            """, (action_plan, confidence_score, session_id))
-                            conn.commit()
-                            conn.close()
+                            await db_execute(COMPLETE_SCOPING_SESSION_SQL, (action_plan, confidence_score, session_id))
                             
                             results_comment = f"""## 🤖 Devin Analysis Results
 
@@ -377,25 +570,14 @@ Please check the [Devin session]({session_details.get('url', '#')}) for detailed
 
 ---
 *Session ID: `{session_id}`*
-*Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}*"""
+*Analysis completed at: {completed_at}*"""
                             
                             await post_github_comment(issue_number, results_comment, repo)
                             break
                     
-                    conn = sqlite3.connect("issues.db")
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE issue_sessions 
-                        SET status = 'blocked', updated_at = CURRENT_TIMESTAMP
-                        WHERE devin_session_id = ?
-                    """, (session_id,))
-                    conn.commit()
-                    
-                    cursor.execute("SELECT COUNT(*) FROM issue_sessions WHERE devin_session_id = ? AND status = 'blocked'", (session_id,))
-                    blocked_count = cursor.fetchone()[0]
-                    conn.close()
+                    newly_blocked = await db_execute(MARK_SESSION_BLOCKED_SQL, (session_id,))
                     
-                    if blocked_count == 1 and not os.getenv("DISABLE_BLOCKED_COMMENTS", "").lower() in ["true", "1", "yes"]:
+                    if newly_blocked and not os.getenv("DISABLE_BLOCKED_COMMENTS", "").lower() in ["true", "1", "yes"]:
                         blocked_comment = f"""## ⚠️ Devin Session Status Update
 
 The Devin session `{session_id}` is currently blocked and may require user input. I'll continue monitoring for completion.
@@ -404,11 +586,17 @@ Please check the [Devin session]({session_details.get('url', '#')}) to see what
                         
                         await post_github_comment(issue_number, blocked_comment, repo)
                 
-                await asyncio.sleep(poll_interval)
+                if status == "blocked":
+                    # Blocked sessions are waiting on user input, so there is no point polling them quickly
+                    poll_interval = max_poll_interval
+                else:
+                    poll_interval = min(max_poll_interval, poll_interval * 1.5)
+                next_poll_delay = poll_interval + random.uniform(0, poll_interval * 0.1)
                 
             except Exception as e:
                 logger.error(f"Error checking session {session_id} status: {str(e)}")
-                await asyncio.sleep(poll_interval)
+                poll_interval = min(max_poll_interval, poll_interval * 2)
+                next_poll_delay = poll_interval + random.uniform(0, poll_interval * 0.1)
                 continue
                 
     except Exception as e:
@@ -428,6 +616,12 @@ Please try again or contact support if this issue persists."""
             await post_github_comment(issue_number, error_comment, repo)
         except Exception as comment_error:
             logger.error(f"Failed to post error comment: {str(comment_error)}")
+    finally:
+        active_monitors.discard(session_id)
+
+async def monitor_devin_sessions(sessions: List[tuple]):
+    """Monitor several (session_id, issue_number, repo, session_type) sessions concurrently."""
+    await asyncio.gather(*(monitor_devin_session(*session) for session in sessions), return_exceptions=True)
 
 @app.get("/")
 async def root():
@@ -439,49 +633,19 @@ async def get_issues(repo: str = "google/meridian", state: str = "open", labels:
     issues = await get_github_issues(repo, state, labels)
     return issues
 
-@app.post("/scope-issue")
-async def scope_issue(request: DevinScopeRequest, background_tasks: BackgroundTasks):
-    """Have Devin analyze and scope an issue"""
+async def start_issue_scoping(request: DevinScopeRequest, background_tasks: BackgroundTasks):
+    """Start a Devin scoping session for an issue and queue its "started" comment. Callers schedule the monitor."""
     
-    if not devin_client:
-        raise HTTPException(
-            status_code=503, 
-            detail="Devin integration is not configured. Please set the DEVIN_API_KEY environment variable to enable issue scoping."
-        )
+    scope_message = build_analyze_prompt(request.issue_title, request.issue_body, request.repo)
     
-    scope_message = f"""
-Please analyze this GitHub issue and provide:
-1. A detailed action plan (step-by-step approach)
-2. A confidence score (1-100%) indicating your ability to resolve this issue
-
-Issue Title: {request.issue_title}
-Issue Description: {request.issue_body or "No description provided"}
-
-Please format your response as:
-ACTION PLAN:
-[Your detailed step-by-step plan]
-
-CONFIDENCE SCORE: [Your confidence percentage]%
-"""
+    session_response = await create_devin_session(scope_message)
+    session_id = session_response.get("session_id")
     
-    try:
-        session_response = await create_devin_session(scope_message)
-        session_id = session_response.get("session_id")
-        
-        if not session_id:
-            raise HTTPException(status_code=500, detail="No session ID returned from Devin API")
-        
-        conn = sqlite3.connect("issues.db")
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO issue_sessions (issue_number, issue_title, devin_session_id, status)
-            VALUES (?, ?, ?, ?)
-        """, (request.issue_number, request.issue_title, session_id, "scoping"))
-        conn.commit()
-        conn.close()
-        
-        session_url = session_response.get("url", "#")
-        comment = f"""🤖 **Devin AI Analysis Started**
+    if not session_id:
+        raise HTTPException(status_code=500, detail="No session ID returned from Devin API")
+    
+    session_url = session_response.get("url", "#")
+    comment = f"""🤖 **Devin AI Analysis Started**
 
 I'm analyzing this issue to provide a detailed action plan and confidence score. 
 
@@ -490,68 +654,103 @@ I'm analyzing this issue to provide a detailed action plan and confidence score.
 - Session URL: [View Progress]({session_url})
 
 I'll post the results here once the analysis is complete (typically within 10-30 minutes)."""
-        
-        await post_github_comment(request.issue_number, comment, request.repo)
-        
-        background_tasks.add_task(
-            monitor_devin_session, 
-            session_id, 
-            request.issue_number, 
-            request.repo, 
-            "scoping"
+    
+    await record_session(
+        INSERT_SESSION_SQL,
+        (request.issue_number, request.issue_title, session_id, "scoping"),
+        request.issue_number
+    )
+    
+    # The caller doesn't need the comment, so post it after responding. Background tasks run in
+    # order and callers queue monitors only after this returns, so every started comment (all of
+    # them, for a /scope-issues batch) is posted before any monitor begins
+    background_tasks.add_task(post_started_comment, request.issue_number, comment, request.repo)
+    
+    return {
+        "session_id": session_id,
+        "status": "scoping_started",
+        "message": "Devin is analyzing the issue",
+        "url": session_url
+    }
+
+@app.post("/scope-issue")
+async def scope_issue(request: DevinScopeRequest, background_tasks: BackgroundTasks):
+    """Have Devin analyze and scope an issue"""
+    
+    if not app.state.devin_client:
+        raise HTTPException(
+            status_code=503, 
+            detail="Devin integration is not configured. Please set the DEVIN_API_KEY environment variable to enable issue scoping."
         )
-        
-        return {
-            "session_id": session_id,
-            "status": "scoping_started",
-            "message": "Devin is analyzing the issue",
-            "url": session_url
-        }
-        
+    
+    try:
+        result = await start_issue_scoping(request, background_tasks)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start scoping: {str(e)}")
+    
+    background_tasks.add_task(
+        monitor_devin_session, 
+        result["session_id"], 
+        request.issue_number, 
+        request.repo, 
+        "scoping"
+    )
+    return result
+
+@app.post("/scope-issues")
+async def scope_issues(requests: List[DevinScopeRequest], background_tasks: BackgroundTasks):
+    """Have Devin analyze and scope several issues concurrently"""
+    
+    if not app.state.devin_client:
+        raise HTTPException(
+            status_code=503, 
+            detail="Devin integration is not configured. Please set the DEVIN_API_KEY environment variable to enable issue scoping."
+        )
+    
+    results = await asyncio.gather(
+        *(start_issue_scoping(request, background_tasks) for request in requests),
+        return_exceptions=True
+    )
+    
+    responses = []
+    started_sessions = []
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            responses.append({
+                "issue_number": request.issue_number,
+                "status": "failed",
+                "message": f"Failed to start scoping: {str(result)}"
+            })
+        else:
+            responses.append({"issue_number": request.issue_number, **result})
+            started_sessions.append((result["session_id"], request.issue_number, request.repo, "scoping"))
+    
+    # Background tasks run one after another and each monitor can run for 30 minutes,
+    # so the batch shares a single task that monitors every session at once
+    if started_sessions:
+        background_tasks.add_task(monitor_devin_sessions, started_sessions)
+    
+    return responses
 
 @app.post("/resolve-issue")
 async def resolve_issue(request: DevinResolveRequest, background_tasks: BackgroundTasks):
     """Have Devin attempt to resolve an issue"""
     
-    if not devin_client:
+    if not app.state.devin_client:
         raise HTTPException(
             status_code=503, 
             detail="Devin integration is not configured. Please set the DEVIN_API_KEY environment variable to enable issue resolution."
         )
     
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    response = await app.state.gh_client.get(f"/repos/{request.repo}/issues/{request.issue_number}")
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"https://api.github.com/repos/{request.repo}/issues/{request.issue_number}",
-            headers=headers
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=404, detail="Issue not found")
-        
-        issue_data = response.json()
+    if response.status_code != 200:
+        raise HTTPException(status_code=404, detail="Issue not found")
     
-    resolve_message = f"""
-Please resolve this GitHub issue by implementing the necessary changes:
-
-Repository: {request.repo}
-Issue #{request.issue_number}: {issue_data['title']}
-Description: {issue_data['body'] or "No description provided"}
-
-Please:
-1. Analyze the issue thoroughly
-2. Implement the necessary code changes
-3. Create a pull request with your solution
-4. Provide regular updates on your progress
-
-Post updates as comments on the GitHub issue as you work.
-"""
+    issue_data = orjson.loads(response.content)
+    issue_title, issue_body = issue_data['title'], issue_data['body']
+    
+    resolve_message = build_resolve_prompt(request.issue_number, issue_title, issue_body, request.repo)
     
     try:
         session_response = await create_devin_session(resolve_message)
@@ -560,15 +759,6 @@ Post updates as comments on the GitHub issue as you work.
         if not session_id:
             raise HTTPException(status_code=500, detail="No session ID returned from Devin API")
         
-        conn = sqlite3.connect("issues.db")
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO issue_sessions (issue_number, issue_title, devin_session_id, status)
-            VALUES (?, ?, ?, ?)
-        """, (request.issue_number, issue_data['title'], session_id, "resolving"))
-        conn.commit()
-        conn.close()
-        
         session_url = session_response.get("url", "#")
         comment = f"""🚀 **Devin AI Resolution Started**
 
@@ -580,8 +770,13 @@ I'm working on resolving this issue. I'll provide regular updates as I make prog
 
 I'll post updates here as I work through the resolution process."""
         
-        await post_github_comment(request.issue_number, comment, request.repo)
+        await record_session(
+            UPSERT_SESSION_SQL,
+            (request.issue_number, issue_title, session_id, "resolving"),
+            request.issue_number
+        )
         
+        background_tasks.add_task(post_started_comment, request.issue_number, comment, request.repo)
         background_tasks.add_task(
             monitor_devin_session, 
             session_id, 
@@ -601,28 +796,18 @@ I'll post updates here as I work through the resolution process."""
         raise HTTPException(status_code=500, detail=f"Failed to start resolution: {str(e)}")
 
 @app.get("/sessions")
-async def get_sessions():
-    """Get all Devin sessions"""
-    conn = sqlite3.connect("issues.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM issue_sessions ORDER BY created_at DESC")
-    sessions = cursor.fetchall()
-    conn.close()
-    
-    return [
-        {
-            "id": session[0],
-            "issue_number": session[1],
-            "issue_title": session[2],
-            "devin_session_id": session[3],
-            "action_plan": session[4],
-            "confidence_score": session[5],
-            "status": session[6],
-            "created_at": session[7],
-            "updated_at": session[8]
-        }
-        for session in sessions
-    ]
+async def get_sessions(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    plan_length: Optional[int] = Query(None, ge=1)
+):
+    """Get Devin sessions, most recent first, optionally truncating action plans to `plan_length` characters"""
+    if plan_length:
+        sessions = await db_execute(LIST_SESSIONS_TRUNCATED_PLAN_SQL, (plan_length, limit, offset))
+    else:
+        sessions = await db_execute(LIST_SESSIONS_SQL, (limit, offset))
+    
+    return [dict(session) for session in sessions]
 
 if __name__ == "__main__":
     import uvicorn
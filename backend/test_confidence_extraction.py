@@ -105,12 +105,90 @@ No confidence score provided."""
     
     return True
 
+def test_latest_plan_wins():
+    """Test that the most recent action plan and confidence score are returned."""
+    
+    mock_session = {
+        "session_id": "test-session-321",
+        "status_enum": "finished",
+        "messages": [
+            {
+                "type": "devin_message",
+                "message": """ACTION PLAN:
+1. Initial plan
+
+CONFIDENCE SCORE: 40%"""
+            },
+            {
+                "type": "user_message",
+                "message": "Please also consider the ACTION PLAN: for the docs."
+            },
+            {
+                "type": "devin_message",
+                "message": """Updated after looking at the code.
+
+ACTION PLAN:
+1. Revised first step
+2. Revised second step
+
+CONFIDENCE SCORE: 90%"""
+            },
+            {
+                "type": "devin_message",
+                "message": "Let me know if you have questions."
+            }
+        ]
+    }
+    
+    client = DevinClient.__new__(DevinClient)
+    client.api_key = "fake-api-key-for-testing"
+    
+    action_plan, confidence_score = client.extract_action_plan_and_confidence(mock_session)
+    print(f"\nLatest plan: {action_plan!r}, confidence: {confidence_score}")
+    
+    assert action_plan == "1. Revised first step\n2. Revised second step"
+    assert confidence_score == 90
+    return True
+
+def test_extraction_is_cached_until_new_messages():
+    """Test that re-polls with the same messages reuse the result and new messages are parsed."""
+    
+    messages = [
+        {
+            "type": "devin_message",
+            "message": """action plan:
+1. Only step
+
+Confidence: 60%"""
+        }
+    ]
+    client = DevinClient.__new__(DevinClient)
+    client.api_key = "fake-api-key-for-testing"
+    
+    first = client.extract_action_plan_and_confidence({"session_id": "test-session-654", "messages": list(messages)})
+    
+    # Same session and message count: served from the cache without looking at the messages
+    cached = client.extract_action_plan_and_confidence({"session_id": "test-session-654", "messages": [{}]})
+    
+    messages.append({
+        "type": "devin_message",
+        "message": "ACTION PLAN:\n1. Better step\nCONFIDENCE SCORE: 95%"
+    })
+    updated = client.extract_action_plan_and_confidence({"session_id": "test-session-654", "messages": messages})
+    print(f"\nCached: {cached}, after new message: {updated}")
+    
+    assert first == cached == ("1. Only step", 60)
+    assert updated == ("1. Better step", 95)
+    return True
+
 if __name__ == "__main__":
     print("Running confidence extraction tests...")
     success1 = test_confidence_extraction()
     success2 = test_edge_cases()
+    success3 = test_latest_plan_wins()
+    success4 = test_extraction_is_cached_until_new_messages()
     
-    if success1 and success2:
+    if success1 and success2 and success3 and success4:
         print("\n🎉 All tests passed!")
         sys.exit(0)
     else:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that batches of issues are scoped and monitored concurrently using mocked Devin and GitHub APIs.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi.testclient import TestClient
+import main
+from devin_client import DevinClient
+
+FINISHED_SESSION = {
+    "status_enum": "finished",
+    "messages": [{"type": "devin_message", "message": "ACTION PLAN:\n1. Fix it\n\nCONFIDENCE SCORE: 80%"}]
+}
+
+def test_scope_issues_monitors_batch_concurrently():
+    """All started comments are posted and all sessions polled before any monitor posts its results."""
+    
+    events = []
+    created = []
+    
+    def github_handler(request):
+        body = request.content.decode()
+        kind = "started" if "Analysis Started" in body else "results"
+        events.append((kind, request.url.path.split("/")[-2]))
+        return httpx.Response(201, json={"id": 1})
+    
+    def devin_handler(request):
+        if request.method == "POST":
+            created.append(f"s{len(created) + 1}")
+            if "FAIL" in request.content.decode():
+                return httpx.Response(500, text="error")
+            return httpx.Response(200, json={"session_id": created[-1], "url": "https://app.devin.ai/sessions/x"})
+        events.append(("poll", request.url.path.rsplit("/", 1)[-1]))
+        return httpx.Response(200, json=FINISHED_SESSION)
+    
+    original_cwd = os.getcwd()
+    original_keys = main.DEVIN_API_KEY, main.GITHUB_TOKEN
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        main.DEVIN_API_KEY, main.GITHUB_TOKEN = "fake-api-key-for-testing", "fake-token"
+        try:
+            with TestClient(main.app) as client:
+                main.app.state.gh_client._transport = httpx.MockTransport(github_handler)
+                main.app.state.devin_client._client._transport = httpx.MockTransport(devin_handler)
+                
+                response = client.post("/scope-issues", json=[
+                    {"issue_number": number, "issue_title": title, "issue_body": None, "repo": "owner/repo"}
+                    for number, title in [(1, "First"), (2, "FAIL"), (3, "Third")]
+                ])
+                sessions = client.get("/sessions").json()
+        finally:
+            main.DEVIN_API_KEY, main.GITHUB_TOKEN = original_keys
+            os.chdir(original_cwd)
+    
+    print("=== Scope Issues Test Results ===")
+    print(f"Responses: {response.json()}")
+    print(f"Events: {events}")
+    
+    results = response.json()
+    assert response.status_code == 200
+    assert [r["issue_number"] for r in results] == [1, 2, 3]
+    assert [r["status"] for r in results] == ["scoping_started", "failed", "scoping_started"]
+    
+    kinds = [kind for kind, _ in events]
+    assert kinds == ["started", "started", "poll", "poll", "results", "results"]
+    assert {issue for kind, issue in events if kind == "started"} == {"1", "3"}
+    assert {issue for kind, issue in events if kind == "results"} == {"1", "3"}
+    assert {(s["issue_number"], s["status"], s["confidence_score"]) for s in sessions} == {(1, "completed", 80), (3, "completed", 80)}
+    return True
+
+def test_analyze_github_issues_runs_concurrently():
+    """Every issue gets a result in order, failures are returned in place, and sessions are polled together."""
+    
+    polls = []
+    
+    async def handler(request):
+        if request.method == "POST":
+            if "FAIL" in request.content.decode():
+                return httpx.Response(400, text="bad request")
+            title = request.content.decode().split("Issue Title: ")[1].split("\\n")[0]
+            return httpx.Response(200, json={"session_id": f"session-{title}"})
+        polls.append(request.url.path)
+        # Both sessions must be waiting on their first poll at once for this to complete
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json=FINISHED_SESSION)
+    
+    async def analyze():
+        async with DevinClient("fake-api-key-for-testing") as client:
+            client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+            started = asyncio.get_running_loop().time()
+            results = await client.analyze_github_issues([
+                {"issue_title": "A"},
+                {"issue_title": "FAIL"},
+                {"issue_title": "B", "issue_body": "body", "repo": "owner/repo"},
+            ])
+            return results, asyncio.get_running_loop().time() - started
+    
+    results, elapsed = asyncio.run(analyze())
+    print(f"\nResults: {[r if isinstance(r, Exception) else r['session_id'] for r in results]}, elapsed {elapsed:.2f}s")
+    
+    assert results[0]["session_id"] == "session-A"
+    assert results[0]["confidence_score"] == 80
+    assert results[2]["session_id"] == "session-B"
+    assert getattr(results[1], "status_code", None) == 400
+    assert sorted(polls) == ["/v1/session/session-A", "/v1/session/session-B"]
+    assert elapsed < 0.35
+    return True
+
+if __name__ == "__main__":
+    print("Running scope issues tests...")
+    success1 = test_scope_issues_monitors_batch_concurrently()
+    success2 = test_analyze_github_issues_runs_concurrently()
+    
+    if success1 and success2:
+        print("\n🎉 All tests passed!")
+        sys.exit(0)
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
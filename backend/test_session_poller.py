@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that DevinSessionPoller batches session polls using a mocked Devin API.
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import devin_client
+from devin_client import DevinClient, DevinSessionPoller
+
+def run_poller(scenario, statuses):
+    """Run `scenario(poller)` against a mock API that serves `statuses`, returning (result, requested paths)."""
+
+    requested = []
+
+    def handler(request):
+        session_id = request.url.path.rsplit("/", 1)[-1]
+        requested.append(session_id)
+        status = statuses[session_id]
+        if isinstance(status, int):
+            return httpx.Response(status, text="error")
+        return httpx.Response(200, json={"session_id": session_id, "status_enum": status})
+
+    async def run():
+        async with DevinClient("fake-api-key-for-testing") as client:
+            client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+            poller = DevinSessionPoller(client, coalesce_window=0.2)
+            poller_task = asyncio.create_task(poller.run())
+            try:
+                return await scenario(poller)
+            finally:
+                poller_task.cancel()
+
+    return asyncio.run(run()), requested
+
+def test_requests_due_together_are_batched():
+    """Sessions due within the coalesce window are fetched in one batch; later ones wait their turn."""
+
+    statuses = {"s1": "working", "s2": "blocked", "s3": "finished"}
+    batch_sizes = []
+
+    async def scenario(poller):
+        original = poller.client.get_sessions_details
+
+        async def recording(session_ids, max_concurrency):
+            batch_sizes.append(len(session_ids))
+            return await original(session_ids, max_concurrency)
+
+        poller.client.get_sessions_details = recording
+        return await asyncio.gather(
+            poller.request("s1", 0.05),
+            poller.request("s2", 0.1),
+            poller.request("s3", 0.5),
+        )
+
+    results, requested = run_poller(scenario, statuses)
+
+    print("=== Batching Test Results ===")
+    print(f"Statuses: {[r['status_enum'] for r in results]}")
+    print(f"Batch sizes: {batch_sizes}")
+
+    assert [r["session_id"] for r in results] == ["s1", "s2", "s3"]
+    assert batch_sizes == [2, 1]
+    assert sorted(requested) == ["s1", "s2", "s3"]
+    return True
+
+def test_errors_and_duplicate_requests():
+    """A failing session raises for its caller only, and duplicate requests share one fetch."""
+
+    statuses = {"ok": "working", "bad": 404}
+
+    async def scenario(poller):
+        return await asyncio.gather(
+            poller.request("ok"),
+            poller.request("ok"),
+            poller.request("bad"),
+            return_exceptions=True,
+        )
+
+    results, requested = run_poller(scenario, statuses)
+    print(f"\nResults: {results}")
+
+    assert results[0] == results[1] == {"session_id": "ok", "status_enum": "working"}
+    assert isinstance(results[2], devin_client.DevinAPIError)
+    assert results[2].status_code == 404
+    assert sorted(requested) == ["bad", "ok"]
+    return True
+
+def test_cancel_during_batch_cancels_waiters():
+    """Cancelling the poller mid-fetch cancels the requests in that batch instead of leaving them waiting."""
+
+    async def run():
+        fetch_started = asyncio.Event()
+
+        async def handler(request):
+            fetch_started.set()
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={"status_enum": "working"})
+
+        async with DevinClient("fake-api-key-for-testing") as client:
+            client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+            poller = DevinSessionPoller(client)
+            poller_task = asyncio.create_task(poller.run())
+            in_flight = asyncio.create_task(poller.request("in-flight"))
+            await fetch_started.wait()
+            queued = asyncio.create_task(poller.request("queued", 60))
+            await asyncio.sleep(0)
+
+            poller_task.cancel()
+            results = await asyncio.wait_for(asyncio.gather(in_flight, queued, return_exceptions=True), 1)
+            return results, poller_task.cancelled()
+
+    results, poller_cancelled = asyncio.run(run())
+    print(f"\nWaiter results after cancelling the poller: {results}")
+
+    assert poller_cancelled
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    return True
+
+if __name__ == "__main__":
+    print("Running DevinSessionPoller tests...")
+    success1 = test_requests_due_together_are_batched()
+    success2 = test_errors_and_duplicate_requests()
+    success3 = test_cancel_during_batch_cancels_waiters()
+
+    if success1 and success2 and success3:
+        print("\n🎉 All tests passed!")
+        sys.exit(0)
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the polling backoff in DevinClient.wait_for_completion using a mocked Devin API.
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import devin_client
+from devin_client import DevinClient
+
+def run_polling(responses, **kwargs):
+    """Poll a mock session that replays `responses`, returning (result or exception, sleep delays)."""
+
+    remaining = list(responses)
+    delays = []
+
+    def handler(request):
+        return remaining.pop(0)
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    async def poll():
+        async with DevinClient("fake-api-key-for-testing") as client:
+            client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+            try:
+                return await client.wait_for_completion("test-session-123", **kwargs)
+            except Exception as e:
+                return e
+
+    original_sleep = devin_client._sleep
+    devin_client._sleep = fake_sleep
+    try:
+        result = asyncio.run(poll())
+    finally:
+        devin_client._sleep = original_sleep
+
+    return result, delays
+
+def test_backoff_grows_and_resets_on_status_change():
+    """Delays grow while the status is unchanged and reset when it changes."""
+
+    responses = (
+        [httpx.Response(200, json={"status_enum": "working"}) for _ in range(20)]
+        + [httpx.Response(200, json={"status_enum": "suspend_requested"})]
+        + [httpx.Response(200, json={"status_enum": "finished"})]
+    )
+
+    result, delays = run_polling(responses, poll_interval=30, initial_poll_interval=0.5, poll_backoff_base=1.3)
+
+    print("=== Backoff Test Results ===")
+    print(f"Final status: {result.get('status_enum')}")
+    print(f"Delays: {[round(d, 2) for d in delays]}")
+
+    assert result["status_enum"] == "finished"
+    assert len(delays) == 21
+    for attempt, delay in enumerate(delays[:20]):
+        assert 0 <= delay <= min(30, 0.5 * 1.3 ** attempt)
+    assert delays[20] <= 0.5
+    return True
+
+def test_transient_errors_are_retried():
+    """5xx responses are retried; non-transient errors are raised."""
+
+    responses = [
+        httpx.Response(503, text="unavailable"),
+        httpx.Response(502, text="bad gateway"),
+        httpx.Response(200, json={"status_enum": "finished"}),
+    ]
+    result, delays = run_polling(responses)
+    print(f"\nTransient errors - final status: {result.get('status_enum')}, retries: {len(delays)}")
+    assert result["status_enum"] == "finished"
+    assert len(delays) == 2
+
+    result, delays = run_polling([httpx.Response(404, text="not found")])
+    print(f"Non-transient error raised: {result!r}")
+    assert isinstance(result, devin_client.DevinAPIError)
+    assert result.status_code == 404
+    assert delays == []
+    return True
+
+if __name__ == "__main__":
+    print("Running wait_for_completion polling tests...")
+    success1 = test_backoff_grows_and_resets_on_status_change()
+    success2 = test_transient_errors_are_retried()
+
+    if success1 and success2:
+        print("\n🎉 All tests passed!")
+        sys.exit(0)
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)